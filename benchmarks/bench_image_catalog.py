@@ -0,0 +1,108 @@
+"""ImageCatalog の走査・並び替え時間と 1 行あたりのメモリを計測するベンチマーク。
+
+    python benchmarks/bench_image_catalog.py [--count 2000]
+
+一時フォルダに小さな画像を生成して走査するため、ディスプレイは不要。
+
+メモリは 1 行あたりで次を比較する。
+
+- records: ImageCatalog が保持するレコードと索引 (tracemalloc で計測)
+- string rows: 旧実装と同じ 6 つの表示用文字列を Python のタプルで持った場合
+- treeview text: Treeview に渡す項目 ID とセルの文字列の UTF-8 バイト数。
+  旧実装は隠しカラムにフルパスを持ち、現行は項目 ID にフルパスを使う。
+  Tk 側の文字列オブジェクトの数はどちらも 7 個で同じなので、文字列の長さだけを比べる。
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from PIL import Image
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from image_viewer.image_catalog import SORT_KEYS, ImageCatalog  # noqa: E402
+
+
+def _populate(folder: Path, count: int) -> None:
+    """縦横比の異なる PNG を count 枚生成する。幅と高さは小さい整数のキャッシュに収まらない値にする。"""
+    for index in range(count):
+        size = (300 + index % 7, 260 + index % 5)
+        Image.new("L", size).save(folder / f"image_{index:05d}.png")
+
+
+def _legacy_rows(catalog: ImageCatalog) -> list[tuple[str, ...]]:
+    """旧実装が Treeview に入れていた 6 つの文字列 (末尾はフルパス)。"""
+    return [
+        (record.name, record.size_text, record.ratio_text, record.ext, record.created_text, record.path)
+        for record in catalog
+    ]
+
+
+def _treeview_text_bytes(catalog: ImageCatalog) -> tuple[float, float]:
+    """旧実装と現行の Treeview の項目 ID とセルの文字列の、1 行あたりの UTF-8 バイト数。"""
+    legacy = current = 0
+    for number, record in enumerate(catalog, start=1):
+        cells = (record.name, record.size_text, record.ratio_text, record.ext, record.created_text)
+        cell_bytes = sum(len(cell.encode("utf-8")) for cell in cells)
+        legacy += cell_bytes + len(record.path.encode("utf-8")) + len(f"I{number:03X}")
+        current += cell_bytes + len(record.orientation_text.encode("utf-8")) + len(record.path.encode("utf-8"))
+    rows = max(len(catalog), 1)
+    return legacy / rows, current / rows
+
+
+def _traced_bytes(build) -> tuple[object, int]:
+    """build() の戻り値と、それが保持し続けるメモリ量を返す。"""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def _scan(folder: Path) -> ImageCatalog:
+    catalog = ImageCatalog()
+    catalog.scan(folder)
+    return catalog
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        folder = Path(temp_dir)
+        _populate(folder, args.count)
+
+        catalog = ImageCatalog()
+        start = time.perf_counter()
+        catalog.scan(folder)
+        scan_seconds = time.perf_counter() - start
+        print(f"scan      {scan_seconds * 1000:8.2f} ms for {len(catalog)} images")
+
+        rows = max(len(catalog), 1)
+        catalog, record_bytes = _traced_bytes(lambda: _scan(folder))
+        _, string_row_bytes = _traced_bytes(lambda: _legacy_rows(catalog))
+        legacy_text, current_text = _treeview_text_bytes(catalog)
+        print(f"memory    records       {record_bytes / rows:8.1f} bytes/row")
+        print(f"memory    string rows   {string_row_bytes / rows:8.1f} bytes/row")
+        print(f"memory    treeview text {legacy_text:8.1f} -> {current_text:.1f} bytes/row (legacy -> current)")
+
+        for column in SORT_KEYS:
+            start = time.perf_counter()
+            catalog.sort_by(column)
+            print(f"sort {column:<8} {(time.perf_counter() - start) * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
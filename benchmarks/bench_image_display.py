@@ -0,0 +1,231 @@
+"""ImageDisplay の 1 フレームあたりの描画コストを計測するベンチマーク。
+
+ナビゲーション (同じサイズの画像を次々に表示)、リサイズ (ウィンドウサイズ変更)、
+サイズの変わらない <Configure> の 3 パターンについて、旧実装 (Label + 毎回
+PhotoImage 生成) と現行実装 (Canvas の画像アイテム + PhotoImage.paste による
+再利用) を比較する。リサイズ系の描画は各ウィジェット自身の <Configure> バインドに
+任せ、実際のアプリと同じ回数だけ計測する。
+
+    python benchmarks/bench_image_display.py [--frames 200] [--size 4000x3000] [--headless]
+
+Tk のウィンドウを生成するため、ディスプレイ (または Xvfb) が必要。
+``--headless`` ではディスプレイなしで、Tk の呼び出しを何もしないスタブに置き換えて
+描画処理 (リサイズ・向きの適用・再描画の要否判定) のコストだけを計測する。
+PhotoImage の生成と paste のコストはこのモードでは含まれない。
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tkinter as tk
+from itertools import cycle
+from pathlib import Path
+
+from PIL import Image, ImageTk
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from image_viewer.image_display import ImageDisplay  # noqa: E402
+
+
+class LegacyImageDisplay(tk.Canvas):
+    """比較用に旧実装の描画処理だけを再現したウィジェット。"""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.original_image = None
+        self.photo = None
+
+        self.bind("<Configure>", self.show_image)
+
+        self.label = tk.Label(self)
+        self.label.pack(fill=tk.BOTH, expand=True)
+
+    def set_image(self, image):
+        self.original_image = image
+        self.show_image()
+
+    def show_image(self, event=None):
+        if self.original_image is None:
+            return
+        img_width, img_height = self.original_image.size
+        canvas_width = max(self.winfo_width(), 1)
+        canvas_height = max(self.winfo_height(), 1)
+        resize_ratio = min(canvas_width / img_width, canvas_height / img_height)
+        new_size = (max(1, int(img_width * resize_ratio)), max(1, int(img_height * resize_ratio)))
+        resized = self.original_image.resize(new_size, Image.LANCZOS)
+        self.photo = ImageTk.PhotoImage(resized)
+        self.label.config(image=self.photo)
+        self.label.image = self.photo
+
+
+class CanvasImageDisplay(ImageDisplay):
+    """現行実装。読み込み完了時と同じ経路 (``_set_image``) で画像を差し替える。"""
+
+    def set_image(self, image):
+        self._set_image(image)
+
+
+def _make_images(size: tuple[int, int], count: int) -> list[Image.Image]:
+    """色の異なる同サイズの画像を生成する。"""
+    return [Image.new("RGB", size, ((index * 40) % 256, 128, 200)) for index in range(count)]
+
+
+def _navigate(root: tk.Tk, display, images, frames: int) -> None:
+    """同じウィンドウサイズのまま画像だけを切り替える。"""
+    for index in range(frames):
+        display.set_image(images[index % len(images)])
+        root.update_idletasks()
+
+
+def _resize(root: tk.Tk, display, images, frames: int) -> None:
+    """画像はそのままでウィンドウサイズを変える。描画は各ウィジェット自身の <Configure> に任せる。"""
+    geometries = ["820x620", "780x580", "900x700", "800x600"]
+    for index in range(frames):
+        root.geometry(geometries[index % len(geometries)])
+        root.update()
+
+
+def _configure(root: tk.Tk, display, images, frames: int) -> None:
+    """サイズの変わらない <Configure> (ウィンドウ移動や再配置) が届いた場合。"""
+    for _ in range(frames):
+        display.event_generate("<Configure>")
+        root.update()
+
+
+SCENARIOS = {
+    "navigation": _navigate,
+    "resize": _resize,
+    "configure": _configure,
+}
+
+
+class _HeadlessWidget:
+    """Tk の代わりにウィンドウサイズだけを持ち、Tk の呼び出しは何もしないスタブ。"""
+
+    def __init__(self):
+        self.size = (800, 600)
+        self.original_image = None
+
+    def winfo_width(self):
+        return self.size[0]
+
+    def winfo_height(self):
+        return self.size[1]
+
+    def coords(self, *args):
+        pass
+
+    def itemconfigure(self, *args, **kwargs):
+        pass
+
+    def _update_photo(self, image):
+        pass
+
+
+class HeadlessLegacyImageDisplay(_HeadlessWidget):
+    """旧実装の描画処理。<Configure> のたびに元画像から LANCZOS でリサイズする。"""
+
+    set_image = LegacyImageDisplay.set_image
+
+    def show_image(self, event=None):
+        img_width, img_height = self.original_image.size
+        canvas_width, canvas_height = self.size
+        resize_ratio = min(canvas_width / img_width, canvas_height / img_height)
+        new_size = (max(1, int(img_width * resize_ratio)), max(1, int(img_height * resize_ratio)))
+        self._update_photo(self.original_image.resize(new_size, Image.LANCZOS))
+
+
+class HeadlessCanvasImageDisplay(_HeadlessWidget):
+    """現行実装の描画処理 (ImageDisplay のメソッドをそのまま使う)。"""
+
+    show_image = ImageDisplay.show_image
+    _set_image = ImageDisplay._set_image
+    _center_items = ImageDisplay._center_items
+    set_image = CanvasImageDisplay.set_image
+
+    def __init__(self):
+        super().__init__()
+        self.current_image = None
+        self.zoom = "fit"
+        self.orientation = 1
+        self._image_item = self._message_item = None
+        self._render_key = None
+        self._partial = False
+
+
+def _headless_navigate(display, images, frames: int) -> None:
+    for index in range(frames):
+        display.set_image(images[index % len(images)])
+
+
+def _headless_resize(display, images, frames: int) -> None:
+    sizes = cycle([(820, 620), (780, 580), (900, 700), (800, 600)])
+    for _ in range(frames):
+        display.size = next(sizes)
+        display.show_image()
+
+
+def _headless_configure(display, images, frames: int) -> None:
+    for _ in range(frames):
+        display.show_image()
+
+
+HEADLESS_SCENARIOS = {
+    "navigation": _headless_navigate,
+    "resize": _headless_resize,
+    "configure": _headless_configure,
+}
+
+
+def _run_headless(images, frames: int) -> None:
+    for name, scenario in HEADLESS_SCENARIOS.items():
+        for label, factory in (("legacy", HeadlessLegacyImageDisplay), ("canvas", HeadlessCanvasImageDisplay)):
+            display = factory()
+            display.set_image(images[0])
+
+            start = time.perf_counter()
+            scenario(display, images, frames)
+            per_frame = (time.perf_counter() - start) / frames
+            print(f"{name:<10} {label:<7} {per_frame * 1000:8.2f} ms/frame (headless)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--size", default="4000x3000", help="元画像のサイズ (幅x高さ)")
+    parser.add_argument("--headless", action="store_true", help="ディスプレイなしで Tk 以外の描画処理だけを計測する")
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.size.lower().split("x"))
+    images = _make_images((width, height), 4)
+
+    if args.headless:
+        _run_headless(images, args.frames)
+        return
+
+    for name, scenario in SCENARIOS.items():
+        for label, factory in (("legacy", LegacyImageDisplay), ("canvas", CanvasImageDisplay)):
+            root = tk.Tk()
+            root.geometry("800x600")
+            display = factory(root)
+            display.pack(fill=tk.BOTH, expand=True)
+            root.update()
+            display.set_image(images[0])
+            root.update()
+
+            start = time.perf_counter()
+            scenario(root, display, images, args.frames)
+            per_frame = (time.perf_counter() - start) / args.frames
+            root.destroy()
+            print(f"{name:<10} {label:<7} {per_frame * 1000:8.2f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
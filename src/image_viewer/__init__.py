@@ -2,5 +2,6 @@
 """画像ビューア機能をまとめたパッケージ。"""
 
 from .app import ViewerWindow, run
+from .image_catalog import ImageCatalog, ImageRecord
 
-__all__ = ["ViewerWindow", "run"]
+__all__ = ["ImageCatalog", "ImageRecord", "ViewerWindow", "run"]
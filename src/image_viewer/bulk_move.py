@@ -0,0 +1,224 @@
+"""複数画像の一括移動を、分類先ごとにまとめて並列実行するモジュール。
+
+同じファイルシステム内の移動は名前変更だけで済ませる。
+ファイルシステムをまたぐ移動は、上限付きのスレッドプールでコピー・検証・削除を
+行い、一時ファイルへ書き込んでから置き換えることで途中失敗時に中途半端な
+ファイルが分類先に残らないようにする。
+
+分類先の索引は他のプログラムによる変更を取りこぼしうるため、衝突ポリシーが
+``replace`` の場合を除き、最後の書き込みは既存ファイルを上書きせず
+``FileExistsError`` にする。
+"""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .destination_index import MovePlan, full_hash
+
+COPY_CHUNK_SIZE = 1024 * 1024
+DEFAULT_COPY_WORKERS = 4
+PARTIAL_SUFFIX = ".partial"
+
+
+class DestinationConflictError(OSError):
+    """同じ一括移動の中で、複数の計画が同じ移動先を指している。"""
+
+
+@dataclass(frozen=True, slots=True)
+class MoveProgress:
+    """一括移動の進捗。"""
+
+    done: int
+    total: int
+    bytes_done: int
+    elapsed: float
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass(slots=True)
+class BulkMoveResult:
+    """一括移動の結果。skipped は衝突ポリシーにより移動しなかったもの。"""
+
+    moved: list[MovePlan] = field(default_factory=list)
+    skipped: list[MovePlan] = field(default_factory=list)
+    failed: list[tuple[MovePlan, Exception]] = field(default_factory=list)
+    bytes_moved: int = 0
+    elapsed: float = 0.0
+
+
+ProgressCallback = Callable[[MoveProgress], None]
+
+
+def _same_filesystem(source: Path, destination_folder: Path) -> bool:
+    """名前変更だけで移動できるかを判定する。"""
+    try:
+        return os.stat(source).st_dev == os.stat(destination_folder).st_dev
+    except OSError:
+        return False
+
+
+def _place(source: Path, destination: Path, overwrite: bool) -> None:
+    """source を destination へ名前変更する。overwrite でなければ既存ファイルは上書きしない。"""
+    if overwrite:
+        os.replace(source, destination)
+        return
+    try:
+        # ハードリンクの作成は移動先が既にあれば失敗するため、確認と書き込みの間に割り込まれない。
+        os.link(source, destination)
+    except FileExistsError:
+        raise
+    except OSError:
+        # ハードリンクを作れない (FAT や一部の SMB 共有) 場合は、直前に存在を確かめてから名前変更する。
+        if os.path.lexists(destination):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), str(destination)) from None
+        os.rename(source, destination)
+    else:
+        os.unlink(source)
+
+
+def _copy_verify_delete(source: Path, destination: Path, overwrite: bool = False) -> None:
+    """コピーしながらハッシュを取り、書き込み結果を読み直して一致を確認してから元を消す。"""
+    # 並列コピー同士や既存ファイルと衝突しないよう、一時ファイル名は毎回一意にする。
+    descriptor, temporary_name = tempfile.mkstemp(
+        prefix=f".{destination.name}.", suffix=PARTIAL_SUFFIX, dir=destination.parent
+    )
+    temporary = Path(temporary_name)
+    digest = hashlib.blake2b(digest_size=32)
+    try:
+        with os.fdopen(descriptor, "wb") as writer, source.open("rb") as reader:
+            while chunk := reader.read(COPY_CHUNK_SIZE):
+                digest.update(chunk)
+                writer.write(chunk)
+        shutil.copystat(source, temporary)
+        if full_hash(temporary) != digest.hexdigest():
+            raise OSError(f"Copy verification failed: {source} -> {destination}")
+        _place(temporary, destination, overwrite)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+    source.unlink()
+
+
+def move_file(source: str | Path, destination: str | Path, overwrite: bool = False) -> None:
+    """1 ファイルを移動する。overwrite でなければ既存ファイルがある場合に FileExistsError を送出する。"""
+    source = Path(source)
+    destination = Path(destination)
+    if _same_filesystem(source, destination.parent):
+        _place(source, destination, overwrite)
+    else:
+        _copy_verify_delete(source, destination, overwrite)
+
+
+class BulkMover:
+    """MovePlan の一覧を分類先ごとにまとめて実行する。
+
+    ``run`` はブロッキングなので、UI から使う場合は別スレッドで呼び出し、
+    ``on_progress`` で受け取った進捗を UI スレッドへ受け渡す。
+    """
+
+    def __init__(
+        self,
+        plans: Iterable[MovePlan],
+        max_workers: int = DEFAULT_COPY_WORKERS,
+        on_progress: ProgressCallback | None = None,
+    ) -> None:
+        self.plans = list(plans)
+        self.max_workers = max(1, max_workers)
+        self.on_progress = on_progress
+
+        self._lock = threading.Lock()
+        self._result = BulkMoveResult()
+        self._done = 0
+        self._started = 0.0
+
+    def run(self) -> BulkMoveResult:
+        """すべての移動を実行し、結果を返す。"""
+        self._started = time.perf_counter()
+        pending = [plan for plan in self.plans if not plan.skipped]
+        self._result.skipped = [plan for plan in self.plans if plan.skipped]
+        if self.on_progress is not None:
+            self.on_progress(self._progress())
+
+        # 同じ移動先を指す計画を同時に実行すると互いに上書きするため、2 件目以降は失敗扱いにする。
+        groups: dict[Path, list[MovePlan]] = {}
+        claimed: set[str] = set()
+        for plan in pending:
+            destination_key = str(plan.destination).casefold()
+            if destination_key in claimed:
+                self._record(
+                    plan,
+                    error=DestinationConflictError(f"Destination already used in this batch: {plan.destination}"),
+                )
+                continue
+            claimed.add(destination_key)
+            groups.setdefault(plan.destination.parent, []).append(plan)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for destination_folder, group in groups.items():
+                try:
+                    destination_folder.mkdir(parents=True, exist_ok=True)
+                except OSError as error:
+                    for plan in group:
+                        self._record(plan, error=error)
+                    continue
+                for plan in group:
+                    if _same_filesystem(plan.source, destination_folder):
+                        self._execute(plan, rename=True)
+                    else:
+                        executor.submit(self._execute, plan, rename=False)
+
+        self._result.elapsed = time.perf_counter() - self._started
+        return self._result
+
+    def _execute(self, plan: MovePlan, rename: bool) -> None:
+        try:
+            size = plan.source.stat().st_size
+            overwrite = plan.status == "replaced"
+            if rename:
+                _place(plan.source, plan.destination, overwrite)
+            else:
+                _copy_verify_delete(plan.source, plan.destination, overwrite)
+        except Exception as error:  # 失敗は結果にまとめて報告する
+            self._record(plan, error=error)
+        else:
+            self._record(plan, size=size)
+
+    def _record(self, plan: MovePlan, size: int = 0, error: Exception | None = None) -> None:
+        """1 件分の結果を記録し、進捗を通知する。複数スレッドから呼ばれる。"""
+        with self._lock:
+            if error is None:
+                self._result.moved.append(plan)
+                self._result.bytes_moved += size
+            else:
+                self._result.failed.append((plan, error))
+            self._done += 1
+            progress = self._progress()
+
+        if self.on_progress is not None:
+            self.on_progress(progress)
+
+    def _progress(self) -> MoveProgress:
+        return MoveProgress(
+            self._done,
+            len(self.plans) - len(self._result.skipped),
+            self._result.bytes_moved,
+            time.perf_counter() - self._started,
+        )
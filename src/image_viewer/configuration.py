@@ -31,8 +31,15 @@ DEFAULT_CONFIG: dict[str, Any] = {
     "images": {
         "supported_extensions": [".jpg", ".jpeg", ".png", ".gif"],
     },
+    "moving": {
+        "collision_policy": "rename",
+        "skip_duplicates": True,
+        "copy_workers": 4,
+    },
 }
 
+COLLISION_POLICIES = ("skip", "rename", "replace")
+
 
 def _deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
     """Recursively merge two dictionaries, returning a new structure."""
@@ -94,6 +101,18 @@ def _build_config_text(config: dict[str, Any]) -> str:
     lines.extend(_dump_array("supported_extensions", config["images"].get("supported_extensions", [])))
     lines.append("")
 
+    lines.append("# 分類フォルダへ移動する際の設定。")
+    lines.append("[moving]")
+    lines.append("# 同名ファイルがある場合の扱い: \"skip\" (移動しない) / \"rename\" (連番を付ける) / \"replace\" (上書き)")
+    lines.append(
+        f"collision_policy = {json.dumps(config['moving'].get('collision_policy', 'rename'), ensure_ascii=False)}"
+    )
+    lines.append("# 同一内容の画像が既に分類先にある場合は移動しない。")
+    lines.append(f"skip_duplicates = {json.dumps(bool(config['moving'].get('skip_duplicates', True)))}")
+    lines.append("# 別ドライブへ一括移動する際に並列でコピーするファイル数。")
+    lines.append(f"copy_workers = {int(config['moving'].get('copy_workers', 4))}")
+    lines.append("")
+
     return "\n".join(lines)
 
 
@@ -222,6 +241,26 @@ def get_folder_settings() -> tuple[list[str], tuple[int, int]]:
     return folder_paths, icon_size
 
 
+def get_move_settings() -> tuple[str, bool]:
+    """Return the collision policy and duplicate handling used when moving images."""
+    config = _manager.load()
+    moving_config = config.get("moving", {})
+    policy = moving_config.get("collision_policy", "rename")
+    if policy not in COLLISION_POLICIES:
+        policy = "rename"
+    return policy, bool(moving_config.get("skip_duplicates", True))
+
+
+def get_copy_workers() -> int:
+    """Return how many files may be copied in parallel during a bulk move."""
+    config = _manager.load()
+    try:
+        workers = int(config.get("moving", {}).get("copy_workers", 4))
+    except (TypeError, ValueError):
+        workers = 4
+    return max(1, workers)
+
+
 def get_last_opened_directory() -> str:
     """Return the last folder opened in the viewer, if any."""
     config = _manager.load()
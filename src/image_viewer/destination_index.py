@@ -0,0 +1,231 @@
+"""分類先フォルダのファイル名と内容ハッシュを保持し、移動時の衝突・重複を検出するモジュール。"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from .configuration import COLLISION_POLICIES
+
+SAMPLE_BLOCK_SIZE = 64 * 1024
+FULL_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def sampled_hash(path: str | Path, size: int | None = None) -> str:
+    """ファイル先頭・中央・末尾のブロックとサイズから簡易ハッシュを計算する。"""
+    if size is None:
+        size = os.stat(path).st_size
+
+    digest = hashlib.blake2b(str(size).encode("ascii"), digest_size=16)
+    with open(path, "rb") as file:
+        if size <= SAMPLE_BLOCK_SIZE * 3:
+            digest.update(file.read())
+        else:
+            for offset in (0, (size - SAMPLE_BLOCK_SIZE) // 2, size - SAMPLE_BLOCK_SIZE):
+                file.seek(offset)
+                digest.update(file.read(SAMPLE_BLOCK_SIZE))
+    return digest.hexdigest()
+
+
+def full_hash(path: str | Path) -> str:
+    """ファイル全体のハッシュを計算する。"""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as file:
+        while chunk := file.read(FULL_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _name_key(name: str) -> str:
+    """ファイル名の比較キー。
+
+    macOS (APFS) や Windows の既定のボリュームは大文字小文字を区別しないため、
+    常に casefold して比較する。区別するボリュームでは衝突を過剰に検出するが、
+    上書きを見逃すより安全側に倒す。
+    """
+    return name.casefold()
+
+
+class _Entry:
+    """分類先フォルダ内の 1 ファイル分の情報。ハッシュは必要になった時点で計算する。
+
+    source は移動予約中のエントリで、内容をまだ移動元から読む必要がある場合に使う。
+    """
+
+    __slots__ = ("name", "size", "sampled", "full", "source")
+
+    def __init__(self, name: str, size: int, source: Path | None = None) -> None:
+        self.name = name
+        self.size = size
+        self.sampled: str | None = None
+        self.full: str | None = None
+        self.source = source
+
+
+@dataclass(frozen=True, slots=True)
+class MovePlan:
+    """移動前に決定した移動先と、衝突・重複の検出結果。"""
+
+    source: Path
+    destination: Path | None
+    status: str
+    duplicate_of: Path | None = None
+
+    @property
+    def skipped(self) -> bool:
+        return self.destination is None
+
+
+class DestinationIndex:
+    """1 つの分類先フォルダについて、名前とサイズ別のファイル一覧を保持する。
+
+    索引はフォルダの更新時刻が変わったとき (外部での変更) にだけ作り直し、
+    このアプリ経由の移動は ``record_added`` で差分更新する。移動直前の更新時刻が
+    索引と一致していた場合に限り、移動による更新時刻の変化を取り込んで再走査を避ける。
+    内容ハッシュはサイズが一致した候補に対してのみ、簡易ハッシュ → 完全ハッシュ
+    の順で遅延計算してキャッシュする。
+    """
+
+    def __init__(self, folder: str | Path) -> None:
+        self.folder = Path(folder)
+        self._by_name: dict[str, _Entry] = {}
+        self._by_size: dict[int, list[_Entry]] = {}
+        self._folder_mtime: int | None = None
+        self._built = False
+
+    def folder_mtime(self) -> int | None:
+        """フォルダの現在の更新時刻を返す。フォルダがなければ None。"""
+        try:
+            return self.folder.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self) -> None:
+        """フォルダが外部で変更されていれば索引を作り直す。"""
+        mtime = self.folder_mtime()
+        if self._built and mtime == self._folder_mtime:
+            return
+
+        self._by_name.clear()
+        self._by_size.clear()
+        if mtime is not None:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        self._add(entry.name, entry.stat().st_size)
+        self._folder_mtime = mtime
+        self._built = True
+
+    def _add(self, name: str, size: int, source: Path | None = None) -> _Entry:
+        entry = _Entry(name, size, source)
+        self._discard(name)
+        self._by_name[_name_key(name)] = entry
+        self._by_size.setdefault(size, []).append(entry)
+        return entry
+
+    def _discard(self, name: str) -> None:
+        entry = self._by_name.pop(_name_key(name), None)
+        if entry is None:
+            return
+        same_size = self._by_size.get(entry.size, [])
+        if entry in same_size:
+            same_size.remove(entry)
+        if not same_size:
+            self._by_size.pop(entry.size, None)
+
+    def contains_name(self, name: str) -> bool:
+        """同名のファイルが分類先に存在するかを返す。"""
+        self._refresh()
+        return _name_key(name) in self._by_name
+
+    def find_duplicate(self, source: str | Path) -> Path | None:
+        """source と同一内容のファイルが分類先にあれば、そのパスを返す。"""
+        self._refresh()
+        source_size = os.stat(source).st_size
+        candidates = self._by_size.get(source_size)
+        if not candidates:
+            return None
+
+        source_sampled = sampled_hash(source, source_size)
+        source_full: str | None = None
+        for entry in candidates:
+            entry_path = entry.source or self.folder / entry.name
+            if entry.sampled is None:
+                entry.sampled = sampled_hash(entry_path, entry.size)
+            if entry.sampled != source_sampled:
+                continue
+            if source_full is None:
+                source_full = full_hash(source)
+            if entry.full is None:
+                entry.full = full_hash(entry_path)
+            if entry.full == source_full:
+                return self.folder / entry.name
+        return None
+
+    def available_name(self, name: str) -> str:
+        """衝突しないファイル名を ``name (1).ext`` 形式で探す。"""
+        self._refresh()
+        if _name_key(name) not in self._by_name:
+            return name
+
+        stem, suffix = os.path.splitext(name)
+        counter = 1
+        while True:
+            candidate = f"{stem} ({counter}){suffix}"
+            if _name_key(candidate) not in self._by_name:
+                return candidate
+            counter += 1
+
+    def plan_move(self, source: str | Path, policy: str, skip_duplicates: bool = True) -> MovePlan:
+        """衝突ポリシーに従って移動先を決める。ファイル操作は行わない。"""
+        if policy not in COLLISION_POLICIES:
+            raise ValueError(f"Unknown collision policy: {policy}")
+
+        source_path = Path(source)
+        duplicate = self.find_duplicate(source_path)
+        if duplicate is not None and skip_duplicates:
+            return MovePlan(source_path, None, "duplicate", duplicate)
+
+        name = source_path.name
+        self._refresh()
+        existing = self._by_name.get(_name_key(name))
+        if existing is None:
+            return MovePlan(source_path, self.folder / name, "moved", duplicate)
+        # 同じ一括移動で予約済みの名前と衝突した場合は、ポリシーに関わらず連番を付ける。
+        # replace だと先に移動した画像を上書きし、skip だと移動しない理由が分かりにくいため。
+        if policy == "rename" or existing.source is not None:
+            return MovePlan(source_path, self.folder / self.available_name(name), "renamed", duplicate)
+        if policy == "skip":
+            return MovePlan(source_path, None, "skipped", duplicate)
+        return MovePlan(source_path, self.folder / name, "replaced", duplicate)
+
+    def reserve(self, plan: MovePlan) -> None:
+        """一括移動の計画段階で、移動先の名前と内容を先に索引へ登録しておく。
+
+        同じ一括移動に含まれる後続のファイルが、この名前と衝突・重複していることを
+        実際の移動を待たずに検出できるようにする。
+        """
+        if plan.destination is None:
+            return
+        self._refresh()
+        self._add(plan.destination.name, plan.source.stat().st_size, plan.source)
+
+    def invalidate(self) -> None:
+        """索引が実際のフォルダと食い違った可能性がある場合に、次回利用時に作り直させる。"""
+        self._built = False
+
+    def record_added(self, path: str | Path, mtime_before: int | None) -> None:
+        """分類先へファイルを追加したことを索引へ反映する。
+
+        mtime_before は追加直前に ``folder_mtime`` で取得した更新時刻。索引の作成時から
+        変わっていなければ、追加後の更新時刻を自分の変更として取り込む。変わっていれば
+        他のプログラムによる変更を含みうるため、次回利用時に作り直させる。
+        """
+        if not self._built or mtime_before != self._folder_mtime:
+            self.invalidate()
+            return
+        path = Path(path)
+        self._add(path.name, path.stat().st_size)
+        self._folder_mtime = self.folder_mtime()
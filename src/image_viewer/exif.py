@@ -0,0 +1,102 @@
+"""EXIF から撮影日時と向きだけを取り出す軽量パーサー。
+
+Pillow が画像ヘッダーを開いた時点で ``info["exif"]`` に保持している APP1
+(PNG では eXIf チャンク) の生データだけを読み、画素のデコードや全タグの
+解析は行わない。
+"""
+
+from __future__ import annotations
+
+import datetime
+import struct
+
+from PIL import Image
+
+EXIF_HEADER = b"Exif\x00\x00"
+
+TAG_ORIENTATION = 0x0112
+TAG_EXIF_IFD = 0x8769
+TAG_DATETIME_ORIGINAL = 0x9003
+
+EXIF_DATETIME_FORMAT = "%Y:%m:%d %H:%M:%S"
+
+# EXIF の Orientation 値から、正しい向きにするための Transpose 操作への対応。
+ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+# 縦横が入れ替わる Orientation 値。
+SWAPPED_ORIENTATIONS = frozenset({5, 6, 7, 8})
+
+
+def _read_ifd(tiff: bytes, offset: int, endian: str) -> dict[int, tuple[int, int, bytes]]:
+    """IFD のエントリを {タグ: (型, 個数, 値フィールド 4 バイト)} として返す。"""
+    (count,) = struct.unpack_from(endian + "H", tiff, offset)
+    entries: dict[int, tuple[int, int, bytes]] = {}
+    for index in range(count):
+        position = offset + 2 + index * 12
+        tag, field_type, value_count = struct.unpack_from(endian + "HHI", tiff, position)
+        entries[tag] = (field_type, value_count, tiff[position + 8 : position + 12])
+    return entries
+
+
+def _parse_orientation(ifd0: dict[int, tuple[int, int, bytes]], endian: str) -> int:
+    """IFD0 の Orientation を返す。未知の値は 1 (回転なし) とみなす。"""
+    if TAG_ORIENTATION not in ifd0:
+        return 1
+    (orientation,) = struct.unpack_from(endian + "H", ifd0[TAG_ORIENTATION][2])
+    return orientation if orientation in ORIENTATION_TRANSPOSE else 1
+
+
+def _parse_capture_time(tiff: bytes, ifd0: dict[int, tuple[int, int, bytes]], endian: str) -> float | None:
+    """Exif IFD の DateTimeOriginal をローカル時刻のタイムスタンプとして返す。"""
+    if TAG_EXIF_IFD not in ifd0:
+        return None
+    (exif_ifd_offset,) = struct.unpack_from(endian + "I", ifd0[TAG_EXIF_IFD][2])
+    exif_ifd = _read_ifd(tiff, exif_ifd_offset, endian)
+    if TAG_DATETIME_ORIGINAL not in exif_ifd:
+        return None
+
+    _, value_count, value = exif_ifd[TAG_DATETIME_ORIGINAL]
+    if value_count > 4:
+        (value_offset,) = struct.unpack_from(endian + "I", value)
+        value = tiff[value_offset : value_offset + value_count]
+    text = value.split(b"\x00", 1)[0].decode("ascii").strip()
+    return datetime.datetime.strptime(text, EXIF_DATETIME_FORMAT).timestamp()
+
+
+def parse_exif_fields(exif: bytes | None) -> tuple[float | None, int]:
+    """EXIF の生データから (撮影日時のタイムスタンプ, Orientation) を返す。
+
+    タグがない、または壊れている項目は撮影日時 None、Orientation 1 として扱う。
+    """
+    if not exif:
+        return None, 1
+    tiff = exif[len(EXIF_HEADER) :] if exif.startswith(EXIF_HEADER) else exif
+
+    if tiff[:2] == b"II":
+        endian = "<"
+    elif tiff[:2] == b"MM":
+        endian = ">"
+    else:
+        return None, 1
+
+    try:
+        (ifd0_offset,) = struct.unpack_from(endian + "I", tiff, 4)
+        ifd0 = _read_ifd(tiff, ifd0_offset, endian)
+        orientation = _parse_orientation(ifd0, endian)
+    except struct.error:
+        return None, 1
+
+    try:
+        captured = _parse_capture_time(tiff, ifd0, endian)
+    except (struct.error, UnicodeDecodeError, ValueError, OverflowError, OSError):
+        captured = None
+
+    return captured, orientation
@@ -0,0 +1,345 @@
+"""Tk に依存しない画像カタログ (走査・メタデータ・並び替え・移動) を提供するモジュール。"""
+
+from __future__ import annotations
+
+import datetime
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from PIL import Image
+
+from .bulk_move import BulkMover, BulkMoveResult, ProgressCallback, move_file
+from .configuration import get_copy_workers, get_move_settings, get_supported_extensions
+from .destination_index import DestinationIndex, MovePlan
+from .exif import SWAPPED_ORIENTATIONS, parse_exif_fields
+
+ORIENTATION_LABELS = {
+    1: "-",
+    2: "左右反転",
+    3: "180°",
+    4: "上下反転",
+    5: "転置",
+    6: "90°",
+    7: "逆転置",
+    8: "270°",
+}
+
+
+class ImageRecord:
+    """一覧の 1 行に相当する画像の情報。表示用文字列は必要になった時点で生成する。
+
+    パスはフォルダとファイル名に分けて持ち、フォルダの文字列は同じフォルダの
+    レコード間で共有する。width / height は EXIF の向きを適用した後の表示上のサイズ。
+    created は EXIF の撮影日時があればそれを、なければファイルの作成日時
+    (取得できない OS では更新日時) を持つ。
+    """
+
+    __slots__ = ("folder", "name", "width", "height", "created", "orientation")
+
+    def __init__(
+        self, folder: str, name: str, width: int, height: int, created: float, orientation: int = 1
+    ) -> None:
+        self.folder = folder
+        self.name = name
+        self.width = width
+        self.height = height
+        self.created = created
+        self.orientation = orientation
+
+    def __repr__(self) -> str:
+        return (
+            f"ImageRecord({self.folder!r}, {self.name!r}, {self.width}, {self.height}, "
+            f"{self.created}, {self.orientation})"
+        )
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.folder, self.name)
+
+    @property
+    def ext(self) -> str:
+        return os.path.splitext(self.name)[1].lower()
+
+    @property
+    def size_text(self) -> str:
+        return f"{self.width} x {self.height}"
+
+    @property
+    def ratio_text(self) -> str:
+        gcd_value = math.gcd(self.width, self.height) or 1
+        return f"{self.width // gcd_value}:{self.height // gcd_value}"
+
+    @property
+    def created_text(self) -> str:
+        return datetime.datetime.fromtimestamp(self.created).strftime("%Y/%m/%d %H:%M")
+
+    @property
+    def orientation_text(self) -> str:
+        return ORIENTATION_LABELS.get(self.orientation, "-")
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogEvent:
+    """カタログの変更通知。
+
+    kind は次のいずれか。
+    - ``"reset"``: 一覧全体が置き換わった (records は新しい全件)
+    - ``"sorted"``: 並び順が変わった (records は並び替え後の全件)
+    - ``"removed"``: 指定レコードが一覧から外れた (records は外れたレコード。一括移動では複数件)
+    """
+
+    kind: str
+    records: tuple[ImageRecord, ...]
+
+
+CatalogListener = Callable[[CatalogEvent], None]
+
+
+SORT_KEYS: dict[str, Callable[[ImageRecord], object]] = {
+    "filename": lambda record: record.name,
+    "size": lambda record: (record.width, record.height),
+    "ratio": lambda record: record.width / record.height if record.height else 0.0,
+    "ext": lambda record: record.ext,
+    "created": lambda record: record.created,
+    "orientation": lambda record: record.orientation,
+}
+
+_IS_WINDOWS = os.name == "nt"
+
+# 移動先に他のプログラムが同名ファイルを作った場合に、索引を作り直して計画し直す回数。
+MOVE_ATTEMPTS = 3
+
+
+def _file_created_time(stat: os.stat_result) -> float:
+    """ファイルの作成日時を返す。
+
+    st_birthtime があればそれを使う。Windows (Python 3.12 未満) では st_ctime が作成日時。
+    POSIX の st_ctime は inode の変更時刻でコピーや移動のたびに変わるため、更新日時で代用する。
+    """
+    birthtime = getattr(stat, "st_birthtime", None)
+    if birthtime is not None:
+        return birthtime
+    if _IS_WINDOWS:
+        return stat.st_ctime
+    return stat.st_mtime
+
+
+class ImageCatalog:
+    """フォルダ内の画像一覧を保持し、変更を購読者へ通知する。"""
+
+    def __init__(self) -> None:
+        self.current_folder: Path | None = None
+        self._records: list[ImageRecord] = []
+        # フォルダ → ファイル名 → レコード。キーはレコードが持つ文字列をそのまま使う。
+        self._index: dict[str, dict[str, ImageRecord]] = {}
+        self._listeners: list[CatalogListener] = []
+        self._destination_indexes: dict[str, DestinationIndex] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[ImageRecord]:
+        return iter(self._records)
+
+    def __contains__(self, path: object) -> bool:
+        return self.get(str(path)) is not None
+
+    def get(self, path: str | Path) -> ImageRecord | None:
+        """パスに対応するレコードを返す。"""
+        folder, name = os.path.split(str(path))
+        return self._index.get(folder, {}).get(name)
+
+    def subscribe(self, listener: CatalogListener) -> None:
+        """変更通知を受け取るコールバックを登録する。"""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: CatalogListener) -> None:
+        """登録済みのコールバックを解除する。"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, kind: str, records: Iterable[ImageRecord]) -> None:
+        event = CatalogEvent(kind, tuple(records))
+        for listener in list(self._listeners):
+            listener(event)
+
+    def scan(self, folder_path: str | Path) -> bool:
+        """指定フォルダ以下の画像を走査し、一覧を置き換える。"""
+        folder = Path(folder_path)
+        if not folder.exists():
+            return False
+
+        supported_extensions = {ext.lower() for ext in get_supported_extensions()}
+        records: list[ImageRecord] = []
+        index: dict[str, dict[str, ImageRecord]] = {}
+        # 同じフォルダのレコードには同じ文字列オブジェクトを持たせる。
+        shared_folders: dict[str, str] = {}
+
+        for file_path in sorted(folder.rglob("*")):
+            if file_path.suffix.lower() not in supported_extensions:
+                continue
+            parent = str(file_path.parent)
+            parent = shared_folders.setdefault(parent, parent)
+            record = self._read_record(file_path, parent)
+            index.setdefault(parent, {})[record.name] = record
+            records.append(record)
+
+        self.current_folder = folder
+        self._records = records
+        self._index = index
+        self._notify("reset", self._records)
+        return True
+
+    @staticmethod
+    def _read_record(file_path: Path, folder: str) -> ImageRecord:
+        """画素をデコードせずに、ヘッダーからサイズと EXIF の撮影日時・向きを読み取る。"""
+        with Image.open(file_path) as img:
+            width, height = img.size
+            captured, orientation = parse_exif_fields(img.info.get("exif"))
+
+        if orientation in SWAPPED_ORIENTATIONS:
+            width, height = height, width
+        if captured is None:
+            captured = _file_created_time(file_path.stat())
+        return ImageRecord(folder, file_path.name, width, height, captured, orientation)
+
+    def sort_by(self, column: str, reverse: bool = False) -> None:
+        """指定カラムで一覧を並び替える。"""
+        key = SORT_KEYS.get(column)
+        if key is None:
+            raise KeyError(f"Unknown sort column: {column}")
+        self._records.sort(key=key, reverse=reverse)
+        self._notify("sorted", self._records)
+
+    def remove(self, path: str | Path) -> ImageRecord | None:
+        """一覧からレコードを外す (ファイル自体は操作しない)。"""
+        removed = self.remove_many((path,))
+        return removed[0] if removed else None
+
+    def remove_many(self, paths: Iterable[str | Path]) -> list[ImageRecord]:
+        """複数のレコードをまとめて一覧から外し、変更通知を 1 回だけ送る。"""
+        removed: list[ImageRecord] = []
+        for path in paths:
+            folder, name = os.path.split(str(path))
+            folder_records = self._index.get(folder)
+            record = folder_records.pop(name, None) if folder_records else None
+            if record is None:
+                continue
+            removed.append(record)
+            if not folder_records:
+                del self._index[folder]
+        if not removed:
+            return removed
+        removed_ids = {id(record) for record in removed}
+        self._records = [record for record in self._records if id(record) not in removed_ids]
+        self._notify("removed", removed)
+        return removed
+
+    def destination_index(self, destination_folder: str | Path) -> DestinationIndex:
+        """分類先フォルダの索引を返す。初回のみ生成し、以後は差分更新して使い回す。"""
+        key = str(Path(destination_folder).resolve())
+        index = self._destination_indexes.get(key)
+        if index is None:
+            index = DestinationIndex(destination_folder)
+            self._destination_indexes[key] = index
+        return index
+
+    def move(
+        self,
+        path: str | Path,
+        destination_folder: str | Path,
+        policy: str | None = None,
+        skip_duplicates: bool | None = None,
+    ) -> MovePlan | None:
+        """画像を指定フォルダへ移動し、一覧から外す。
+
+        同名ファイルや同一内容のファイルが分類先にある場合は、設定の衝突ポリシーに
+        従って移動先を決める。移動しなかった場合もその理由を含む MovePlan を返す。
+        """
+        record = self.get(path)
+        if record is None:
+            return None
+
+        default_policy, default_skip = get_move_settings()
+        destination = Path(destination_folder)
+        destination.mkdir(parents=True, exist_ok=True)
+
+        index = self.destination_index(destination)
+        for attempt in range(MOVE_ATTEMPTS):
+            plan = index.plan_move(
+                record.path,
+                policy or default_policy,
+                default_skip if skip_duplicates is None else skip_duplicates,
+            )
+            if plan.skipped:
+                return plan
+
+            mtime_before = index.folder_mtime()
+            try:
+                move_file(record.path, plan.destination, overwrite=plan.status == "replaced")
+            except FileExistsError:
+                # 索引に載っていないファイルが移動先にあった。索引を作り直して計画し直す。
+                index.invalidate()
+                if attempt == MOVE_ATTEMPTS - 1:
+                    raise
+                continue
+            index.record_added(plan.destination, mtime_before)
+            break
+
+        self.remove(record.path)
+        return plan
+
+    def plan_moves(
+        self,
+        assignments: Iterable[tuple[str | Path, str | Path]],
+        policy: str | None = None,
+        skip_duplicates: bool | None = None,
+    ) -> list[MovePlan]:
+        """(画像パス, 分類先) の組から一括移動の計画を立てる。ファイル操作は行わない。
+
+        計画した移動先は分類先の索引へ予約されるため、同じ一括移動内での
+        名前の衝突や重複も検出される。
+        """
+        default_policy, default_skip = get_move_settings()
+        policy = policy or default_policy
+        skip_duplicates = default_skip if skip_duplicates is None else skip_duplicates
+
+        plans: list[MovePlan] = []
+        for path, destination_folder in assignments:
+            record = self.get(path)
+            if record is None:
+                continue
+            index = self.destination_index(destination_folder)
+            plan = index.plan_move(record.path, policy, skip_duplicates)
+            index.reserve(plan)
+            plans.append(plan)
+        return plans
+
+    def apply_moves(self, result: BulkMoveResult) -> None:
+        """一括移動の結果を索引と一覧へ反映する。一覧の変更通知は 1 回にまとめる。
+
+        一括移動の間に分類先の更新時刻は何度も変わり、他のプログラムによる変更と
+        区別できない。また予約だけして移動できなかったものもありうるため、
+        移動先の索引は次回利用時に作り直させる。
+        """
+        touched = {plan.destination.parent for plan in result.moved}
+        touched.update(plan.destination.parent for plan, _ in result.failed)
+        for folder in touched:
+            self.destination_index(folder).invalidate()
+        self.remove_many(str(plan.source) for plan in result.moved)
+
+    def move_many(
+        self,
+        assignments: Iterable[tuple[str | Path, str | Path]],
+        policy: str | None = None,
+        skip_duplicates: bool | None = None,
+        on_progress: ProgressCallback | None = None,
+    ) -> BulkMoveResult:
+        """複数の画像を一括で移動する。計画・実行・反映を同じスレッドで行う。"""
+        plans = self.plan_moves(assignments, policy, skip_duplicates)
+        result = BulkMover(plans, get_copy_workers(), on_progress).run()
+        self.apply_moves(result)
+        return result
@@ -1,55 +1,172 @@
 """画像を表示するキャンバス用ウィジェット。"""
 
 import tkinter as tk
+from pathlib import Path
+
 from PIL import Image, ImageTk
 
+from .exif import ORIENTATION_TRANSPOSE, SWAPPED_ORIENTATIONS
+from .image_loader import StreamingImageLoader
+
 
 class ImageDisplay(tk.Canvas):
     """画像のリサイズと描画を担当するクラス。"""
 
+    POLL_INTERVAL_MS = 20
+
     def __init__(self, parent):
-        super().__init__(parent)
+        super().__init__(parent, highlightthickness=0)
 
         self.original_image = None
         self.current_image = None
         self.photo = None
         self.zoom = "fit"
+        self.orientation = 1
+
+        # 描画はキャンバス上の単一の画像アイテムで行い、PhotoImage は使い回す。
+        self._image_item = self.create_image(0, 0, anchor=tk.CENTER)
+        # 読み込みに失敗した場合は画像を消し、代わりに理由をキャンバス中央に表示する。
+        self._message_item = self.create_text(0, 0, anchor=tk.CENTER, justify=tk.CENTER)
+        self._photo_key = None
+        self._render_key = None
+
+        # バックグラウンド読み込みの状態。読み込み途中の画像は低コストなリサンプルで描画する。
+        self._loader = None
+        self._poll_id = None
+        self._partial = False
 
         self.bind("<Configure>", self.show_image)
 
-        self.label = tk.Label(self)
-        self.label.pack(fill=tk.BOTH, expand=True)
+    def load_image(self, image_path, orientation=1):
+        """画像をバックグラウンドで読み込み、届いた分から順に表示する。
+
+        orientation は一覧の走査時に読み取った EXIF の向きで、描画時に適用する。
+        """
+        self.cancel_loading()
+        self.orientation = orientation
+        # 原寸表示では縮小デコードした途中画像が小さく表示されてしまうため、draft を使わない。
+        preview_size = None
+        if self.zoom == "fit":
+            preview_size = (max(self.winfo_width(), 1), max(self.winfo_height(), 1))
+            if orientation in SWAPPED_ORIENTATIONS:
+                preview_size = preview_size[::-1]
+        self._loader = StreamingImageLoader(image_path, preview_size=preview_size)
+        self._loader.start()
+        self._poll_id = self.after(self.POLL_INTERVAL_MS, self._poll_loader)
 
-    def load_image(self, image_path):
-        """画像を読み込み、表示用に準備する。"""
-        with Image.open(image_path) as source_image:
-            self.original_image = source_image.copy()
-        self.current_image = self.original_image
+    def cancel_loading(self):
+        """読み込み中の画像があれば中断する。"""
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self._loader is not None:
+            self._loader.cancel()
+            self._loader = None
+
+    def _poll_loader(self):
+        """ローダーからの通知を取り出し、最新の画像だけを描画する。"""
+        self._poll_id = None
+        loader = self._loader
+        if loader is None:
+            return
+
+        updates = loader.poll()
+        if updates:
+            latest = updates[-1]
+            if latest.kind == "error":
+                self._loader = None
+                self._show_error(loader.image_path, latest.error)
+                return
+            self._set_image(latest.image, partial=latest.kind == "partial")
+            if latest.kind == "done":
+                self._loader = None
+                return
+
+        self._poll_id = self.after(self.POLL_INTERVAL_MS, self._poll_loader)
+
+    def _show_error(self, image_path, error):
+        """前の画像を消し、読み込めなかったファイルと理由を表示する。"""
+        self.original_image = None
+        self.current_image = None
+        self.photo = None
+        self._photo_key = None
+        self._render_key = None
+        self.itemconfigure(self._image_item, image="")
+        self.itemconfigure(
+            self._message_item,
+            text=f"画像を読み込めませんでした\n{Path(image_path).name}\n{error}",
+        )
+        self._center_items()
+
+    def _center_items(self):
+        """画像とメッセージをキャンバスの中央に置く。"""
+        canvas_width = max(self.winfo_width(), 1)
+        canvas_height = max(self.winfo_height(), 1)
+        self.coords(self._image_item, canvas_width // 2, canvas_height // 2)
+        self.coords(self._message_item, canvas_width // 2, canvas_height // 2)
+        self.itemconfigure(self._message_item, width=max(canvas_width - 20, 1))
+
+    def _set_image(self, image, partial=False):
+        """表示対象の画像を差し替えて再描画する。"""
+        self.itemconfigure(self._message_item, text="")
+        self.original_image = image
+        self.current_image = image
+        self._partial = partial
+        self._render_key = None
         self.show_image()
 
     def show_image(self, event=None):
         """現在のズーム設定に合わせて画像を描画する。"""
+        self._center_items()
         if self.original_image is None:
             return
 
+        canvas_width = max(self.winfo_width(), 1)
+        canvas_height = max(self.winfo_height(), 1)
+
         image_to_display = self.original_image
+        target_size = image_to_display.size
+
+        # リサイズは回転前の向きで行い、縮小後の小さな画像に対してだけ向きを適用する。
+        transpose = ORIENTATION_TRANSPOSE.get(self.orientation)
+        if self.orientation in SWAPPED_ORIENTATIONS:
+            canvas_width, canvas_height = canvas_height, canvas_width
 
         if self.zoom == "fit":
             img_width, img_height = image_to_display.size
-            canvas_width = max(self.winfo_width(), 1)
-            canvas_height = max(self.winfo_height(), 1)
             width_ratio = canvas_width / img_width
             height_ratio = canvas_height / img_height
             resize_ratio = min(width_ratio, height_ratio)
             new_width = max(1, int(img_width * resize_ratio))
             new_height = max(1, int(img_height * resize_ratio))
+            target_size = (new_width, new_height)
+
+        # ウィンドウ移動などで同じサイズの <Configure> が届いた場合は再描画しない。
+        render_key = (self.zoom, target_size, self._partial, self.orientation)
+        if render_key == self._render_key:
+            return
+
+        if target_size != image_to_display.size:
             # Pillow 10 以降は LANCZOS が高品質リサンプルとして推奨される。
-            image_to_display = image_to_display.resize((new_width, new_height), Image.LANCZOS)
+            resample = Image.BILINEAR if self._partial else Image.LANCZOS
+            image_to_display = image_to_display.resize(target_size, resample)
+        if transpose is not None:
+            image_to_display = image_to_display.transpose(transpose)
 
         self.current_image = image_to_display
-        self.photo = ImageTk.PhotoImage(self.current_image)
-        self.label.config(image=self.photo)
-        self.label.image = self.photo
+        self._update_photo(self.current_image)
+        self._render_key = render_key
+
+    def _update_photo(self, image):
+        """PhotoImage を同じサイズ・モードなら paste で再利用し、異なる場合のみ作り直す。"""
+        photo_key = (image.mode, image.size)
+        if self.photo is not None and photo_key == self._photo_key:
+            self.photo.paste(image)
+            return
+
+        self.photo = ImageTk.PhotoImage(image)
+        self._photo_key = photo_key
+        self.itemconfigure(self._image_item, image=self.photo)
 
     def fit_to_window(self):
         """表示領域に合わせて画像サイズを調整する。"""
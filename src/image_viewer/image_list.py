@@ -2,35 +2,51 @@
 
 from __future__ import annotations
 
-import datetime
-import math
-import shutil
+import queue
+import threading
 import tkinter as tk
 from pathlib import Path
-from tkinter import ttk
+from tkinter import messagebox, ttk
 
-from PIL import Image
-
-from .configuration import get_supported_extensions
+from .bulk_move import BulkMover, BulkMoveResult, MoveProgress
+from .configuration import get_copy_workers
+from .image_catalog import CatalogEvent, ImageCatalog
 
 
 class ImageList(tk.Frame):
     """画像ファイルの一覧表示とナビゲーションを担当するフレーム。"""
 
-    def __init__(self, master=None, image_display=None) -> None:
+    PROGRESS_POLL_MS = 100
+
+    def __init__(self, master=None, image_display=None, catalog: ImageCatalog | None = None) -> None:
         super().__init__(master)
         self.image_display = image_display
-        self.current_folder: Path | None = None
+        self.catalog = catalog if catalog is not None else ImageCatalog()
+
+        self.status_var = tk.StringVar(value="")
+        self._bulk_updates: queue.SimpleQueue | None = None
 
+        self._build_status_bar()
         self.tree = self._build_tree()
         self._configure_bindings()
+        self.catalog.subscribe(self._on_catalog_changed)
+
+    @property
+    def current_folder(self) -> Path | None:
+        """現在読み込んでいるフォルダ。"""
+        return self.catalog.current_folder
+
+    def _build_status_bar(self) -> None:
+        """一括移動の進捗を表示するステータス行を構築する。"""
+        status_label = tk.Label(self, textvariable=self.status_var, anchor=tk.W)
+        status_label.pack(side=tk.BOTTOM, fill=tk.X)
 
     def _build_tree(self) -> ttk.Treeview:
         """一覧用の Treeview とスクロールバーを構築する。"""
         tree = ttk.Treeview(
             self,
-            columns=("filename", "size", "ratio", "ext", "created", "fullpath"),
-            selectmode="browse",
+            columns=("filename", "size", "ratio", "ext", "created", "orientation"),
+            selectmode="extended",
             show="headings",
         )
         tree.heading("filename", text="ファイル名", command=lambda: self._sort_by("filename"))
@@ -48,8 +64,8 @@ class ImageList(tk.Frame):
         tree.heading("created", text="作成日", command=lambda: self._sort_by("created"))
         tree.column("created", anchor=tk.CENTER, width=120)
 
-        tree.heading("fullpath", text="フルパス")
-        tree.column("fullpath", anchor=tk.CENTER, width=0, stretch=False)
+        tree.heading("orientation", text="向き", command=lambda: self._sort_by("orientation"))
+        tree.column("orientation", anchor=tk.CENTER, width=60)
 
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
@@ -63,43 +79,39 @@ class ImageList(tk.Frame):
         """Treeview に必要なイベントをバインドする。"""
         self.tree.bind("<<TreeviewSelect>>", self.on_treeview_select)
         self.tree.bind("<FocusIn>", self._ensure_selection)
+        self.tree.bind("<Control-a>", self.select_all)
 
     def populate_treeview(self, folder_path: str | Path) -> None:
         """指定フォルダから画像を読み込み、一覧へ反映する。"""
-        folder = Path(folder_path)
-        if not folder.exists():
-            return
-
+        self.catalog.scan(folder_path)
+
+    def _on_catalog_changed(self, event: CatalogEvent) -> None:
+        """カタログの変更通知を Treeview に反映する。"""
+        if event.kind == "reset":
+            self._reload_rows(event.records)
+        elif event.kind == "sorted":
+            for index, record in enumerate(event.records):
+                self.tree.move(record.path, "", index)
+        elif event.kind == "removed":
+            self.tree.delete(*(record.path for record in event.records if self.tree.exists(record.path)))
+
+    def _reload_rows(self, records) -> None:
+        """Treeview の全行を作り直し、先頭行を選択する。"""
         self.tree.delete(*self.tree.get_children())
-        self.current_folder = folder
-
-        supported_extensions = {ext.lower() for ext in get_supported_extensions()}
-
-        for file_path in sorted(folder.rglob("*")):
-            if file_path.suffix.lower() not in supported_extensions:
-                continue
-
-            with Image.open(file_path) as img:
-                width, height = img.size
-
-            gcd_value = math.gcd(width, height)
-            ratio = f"{width // gcd_value}:{height // gcd_value}"
-            size_text = f"{width} x {height}"
-
-            created_timestamp = file_path.stat().st_ctime
-            created_dt = datetime.datetime.fromtimestamp(created_timestamp)
-            created_text = created_dt.strftime("%Y/%m/%d %H:%M")
 
+        for record in records:
+            # 行 ID にフルパスを使い、表示用セルから逆算しないようにする。
             self.tree.insert(
                 "",
                 "end",
+                iid=record.path,
                 values=(
-                    file_path.name,
-                    size_text,
-                    ratio,
-                    file_path.suffix.lower(),
-                    created_text,
-                    str(file_path),
+                    record.name,
+                    record.size_text,
+                    record.ratio_text,
+                    record.ext,
+                    record.created_text,
+                    record.orientation_text,
                 ),
             )
 
@@ -111,31 +123,27 @@ class ImageList(tk.Frame):
 
     def on_treeview_select(self, event=None) -> None:
         """選択行のファイルを ImageDisplay に渡す。"""
-        selection = self.tree.selection()
-        if not selection:
+        current_item = self._current_item()
+        if not current_item:
             return
 
-        full_path = Path(self.tree.item(selection[0], "values")[5])
+        full_path = Path(current_item)
+        record = self.catalog.get(current_item)
         if self.image_display:
-            self.image_display.load_image(full_path)
+            self.image_display.load_image(full_path, orientation=record.orientation if record else 1)
 
     def _sort_by(self, column: str, reverse: bool = False) -> None:
         """指定カラムで一覧を並び替える。"""
-        rows = [(self.tree.set(item, column), item) for item in self.tree.get_children("")]
-        rows.sort(reverse=reverse)
-
-        for index, (_, item) in enumerate(rows):
-            self.tree.move(item, "", index)
-
+        self.catalog.sort_by(column, reverse)
         self.tree.heading(column, command=lambda: self._sort_by(column, not reverse))
 
     def select_previous_image(self, event=None) -> None:
         """一つ前の項目を選択し直す。"""
-        selection = self.tree.selection()
-        if not selection:
+        current_item = self._current_item()
+        if not current_item:
             return
 
-        previous_item = self.tree.prev(selection[0])
+        previous_item = self.tree.prev(current_item)
         if previous_item:
             self.tree.selection_set(previous_item)
             self.tree.focus(previous_item)
@@ -144,11 +152,11 @@ class ImageList(tk.Frame):
 
     def select_next_image(self, event=None) -> None:
         """一つ後ろの項目を選択し直す。"""
-        selection = self.tree.selection()
-        if not selection:
+        current_item = self._current_item()
+        if not current_item:
             return
 
-        next_item = self.tree.next(selection[0])
+        next_item = self.tree.next(current_item)
         if next_item:
             self.tree.selection_set(next_item)
             self.tree.focus(next_item)
@@ -163,6 +171,21 @@ class ImageList(tk.Frame):
                 self.tree.selection_set(first_item)
                 self.tree.focus(first_item)
 
+    def select_all(self, event=None) -> str:
+        """一覧に表示中の全項目を選択する。"""
+        children = self.tree.get_children()
+        if children:
+            self.tree.selection_set(children)
+        return "break"
+
+    def _current_item(self) -> str | None:
+        """表示対象の項目 ID を返す。複数選択時はフォーカス行を優先する。"""
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        focused = self.tree.focus()
+        return focused if focused in selection else selection[0]
+
     def _first_tree_item(self) -> str | None:
         """Treeview の先頭項目 ID を返す。"""
         children = self.tree.get_children()
@@ -171,27 +194,125 @@ class ImageList(tk.Frame):
     def move_image(self, index: int, folder_path_vars) -> None:
         """選択中の画像を指定フォルダへ移動し、一覧から削除する。"""
         selection = self.tree.selection()
-        if not selection:
+        if not selection or self._bulk_updates is not None:
             return
 
-        full_path = Path(self.tree.item(selection[0], "values")[5])
         if index >= len(folder_path_vars):
             return
 
-        destination_folder = Path(folder_path_vars[index].get())
-
+        destination_folder = folder_path_vars[index].get()
         if not destination_folder:
             return
 
-        destination_folder.mkdir(parents=True, exist_ok=True)
-        destination_path = destination_folder / full_path.name
-        shutil.move(str(full_path), str(destination_path))
+        if len(selection) > 1:
+            self._start_bulk_move(selection, destination_folder)
+            return
 
         next_item = self.tree.next(selection[0])
-        self.tree.delete(selection[0])
+        plan = self.catalog.move(selection[0], destination_folder)
+        if plan is None:
+            return
+        if plan.skipped:
+            self._warn_skipped_move(plan)
+            return
 
         if next_item:
             self.tree.selection_set(next_item)
             self.tree.focus(next_item)
             self.tree.see(next_item)
             self.on_treeview_select()
+
+    @staticmethod
+    def _skip_reason(plan) -> str:
+        """移動を見送った理由を文章にする。"""
+        if plan.status == "duplicate":
+            return f"同じ内容の画像が既に存在するため移動しませんでした。\n{plan.duplicate_of}"
+        return f"同名のファイルが既に存在するため移動しませんでした。\n{plan.source.name}"
+
+    def _warn_skipped_move(self, plan) -> None:
+        """移動を見送った理由を利用者へ知らせる。"""
+        messagebox.showwarning("移動をスキップしました", self._skip_reason(plan), parent=self)
+
+    def _start_bulk_move(self, selection, destination_folder: str) -> None:
+        """複数選択された画像の移動をバックグラウンドで開始する。"""
+        anchor = min(self.tree.index(item) for item in selection)
+
+        updates: queue.SimpleQueue = queue.SimpleQueue()
+        self._bulk_updates = updates
+        threading.Thread(
+            target=self._run_bulk_move,
+            args=(tuple(selection), destination_folder, updates),
+            daemon=True,
+        ).start()
+
+        self.status_var.set("移動の準備中...")
+        self.after(self.PROGRESS_POLL_MS, self._poll_bulk_move, anchor, destination_folder)
+
+    def _run_bulk_move(self, selection, destination_folder: str, updates: queue.SimpleQueue) -> None:
+        """ワーカースレッドで移動を計画・実行し、進捗と結果をキューへ送る。
+
+        計画では移動元の stat や分類先の走査、内容ハッシュの計算を行うため、
+        Tk のスレッドでは実行しない。
+        """
+        try:
+            plans = self.catalog.plan_moves((item, destination_folder) for item in selection)
+            result = BulkMover(plans, get_copy_workers(), on_progress=updates.put).run()
+        except Exception as error:  # 例外は Tk 側へ渡して表示させる
+            updates.put(error)
+        else:
+            updates.put(result)
+
+    def _poll_bulk_move(self, anchor: int, destination_folder: str) -> None:
+        """一括移動の進捗を表示し、完了したら一覧へまとめて反映する。"""
+        updates = self._bulk_updates
+        if updates is None:
+            return
+
+        result: BulkMoveResult | Exception | None = None
+        while True:
+            try:
+                update = updates.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(update, MoveProgress):
+                self.status_var.set(
+                    f"移動中... {update.done}/{update.total} "
+                    f"({update.files_per_second:.1f} 件/秒, {update.bytes_per_second / 1_000_000:.1f} MB/秒)"
+                )
+            else:
+                result = update
+
+        if result is None:
+            self.after(self.PROGRESS_POLL_MS, self._poll_bulk_move, anchor, destination_folder)
+            return
+
+        self._bulk_updates = None
+        if isinstance(result, Exception):
+            # 計画途中で失敗すると予約だけが索引に残るため、次回利用時に作り直させる。
+            self.catalog.destination_index(destination_folder).invalidate()
+            self.status_var.set("")
+            messagebox.showerror("移動できませんでした", str(result), parent=self)
+            return
+
+        self.catalog.apply_moves(result)
+        self.status_var.set(
+            f"{len(result.moved)} 件を移動しました ({result.elapsed:.1f} 秒, "
+            f"{result.bytes_moved / max(result.elapsed, 1e-6) / 1_000_000:.1f} MB/秒)"
+        )
+
+        children = self.tree.get_children()
+        if children:
+            next_item = children[min(anchor, len(children) - 1)]
+            self.tree.selection_set(next_item)
+            self.tree.focus(next_item)
+            self.tree.see(next_item)
+            self.on_treeview_select()
+
+        self._warn_bulk_problems(result)
+
+    def _warn_bulk_problems(self, result: BulkMoveResult) -> None:
+        """一括移動で見送り・失敗したファイルがあれば利用者へ知らせる。"""
+        messages = [self._skip_reason(plan) for plan in result.skipped]
+        messages.extend(f"{plan.source.name}: {error}" for plan, error in result.failed)
+        if messages:
+            messagebox.showwarning("一部のファイルを移動できませんでした", "\n\n".join(messages[:10]), parent=self)
@@ -0,0 +1,250 @@
+"""画像ファイルを分割して読み込み、途中経過を段階的に表示するためのローダー。
+
+ネットワーク共有のような遅いストレージでは、ファイル全体を読み終えるまで何も
+表示されない。本モジュールはファイルをチャンク単位でバックグラウンド読み込みし、
+それまでに届いたデータだけをデコードした途中画像を一定間隔で通知する。
+
+- JPEG はベースラインなら上から順に、プログレッシブなら全体が段階的に精細になる。
+  途中画像は ``draft`` で表示サイズ程度に縮小デコードして負荷を抑える。
+- PNG は非インターレースなら上から順に表示する。Adam7 インターレースの場合は
+  完了したパスの画素格子だけを拡大したモザイク画像を返す。
+- その他の形式は読み込み完了時にのみ通知する。
+"""
+
+from __future__ import annotations
+
+import io
+import math
+import queue
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image
+
+CHUNK_SIZE = 64 * 1024
+PREVIEW_INTERVAL = 0.1
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+# Adam7 の各パス: (x 開始, y 開始, x 間隔, y 間隔)
+ADAM7_PASSES = (
+    (0, 0, 8, 8),
+    (4, 0, 8, 8),
+    (0, 4, 4, 8),
+    (2, 0, 4, 4),
+    (0, 2, 2, 4),
+    (1, 0, 2, 2),
+    (0, 1, 1, 2),
+)
+# パス n までが完了した時点で既知となる画素格子の間隔 (x, y)
+ADAM7_GRID_STEPS = ((8, 8), (4, 8), (4, 4), (2, 4), (2, 2), (1, 2), (1, 1))
+
+_TRUNCATION_ERRORS = (OSError, EOFError, SyntaxError, IndexError, ValueError, struct.error)
+
+
+@dataclass(frozen=True, slots=True)
+class LoadUpdate:
+    """ローダーからの通知。kind は ``"partial"`` / ``"done"`` / ``"error"`` のいずれか。"""
+
+    kind: str
+    image: Image.Image | None
+    bytes_read: int
+    total_bytes: int
+    error: Exception | None = None
+
+
+def _png_completed_passes(data: bytes) -> int:
+    """途中までの PNG データで、Adam7 の何パス目までが揃っているかを返す。"""
+    if len(data) < 33 or not data.startswith(PNG_SIGNATURE):
+        return 0
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", data[16:26])
+    bits_per_pixel = bit_depth * PNG_CHANNELS.get(color_type, 4)
+
+    inflater = zlib.decompressobj()
+    decompressed = 0
+    position = 8
+    while position + 8 <= len(data):
+        length, chunk_type = struct.unpack(">I4s", data[position : position + 8])
+        payload = data[position + 8 : position + 8 + length]
+        if chunk_type == b"IDAT":
+            decompressed += len(inflater.decompress(payload))
+        if len(payload) < length:
+            break
+        position += 12 + length
+
+    completed = 0
+    required = 0
+    for x0, y0, x_step, y_step in ADAM7_PASSES:
+        pass_width = math.ceil(max(width - x0, 0) / x_step)
+        pass_height = math.ceil(max(height - y0, 0) / y_step)
+        if pass_width and pass_height:
+            required += pass_height * (1 + math.ceil(pass_width * bits_per_pixel / 8))
+        if decompressed < required:
+            break
+        completed += 1
+    return completed
+
+
+def _sample_grid(image: Image.Image, step: tuple[int, int]) -> Image.Image:
+    """既知の画素格子だけを取り出し、元のサイズへ最近傍で拡大する。"""
+    x_step, y_step = step
+    if step == (1, 1):
+        return image
+    width, height = image.size
+    grid_width = math.ceil(width / x_step)
+    grid_height = math.ceil(height / y_step)
+    # NEAREST は出力画素の中心 (間隔の半分だけずれた位置) を参照するため、先にずらしておく。
+    shifted = image.crop(
+        (
+            -(x_step // 2),
+            -(y_step // 2),
+            grid_width * x_step - x_step // 2,
+            grid_height * y_step - y_step // 2,
+        )
+    )
+    grid = shifted.resize((grid_width, grid_height), Image.NEAREST)
+    return grid.resize((grid_width * x_step, grid_height * y_step), Image.NEAREST).crop(
+        (0, 0, width, height)
+    )
+
+
+def decode_partial(data: bytes, preview_size: tuple[int, int] | None = None) -> Image.Image | None:
+    """途中までのデータをデコードし、表示可能な画像を返す。まだ表示できなければ None。"""
+    try:
+        image = Image.open(io.BytesIO(data))
+    except _TRUNCATION_ERRORS:
+        return None
+
+    if image.format not in ("JPEG", "PNG") or len(image.tile) != 1:
+        return None
+
+    completed_passes = 0
+    if image.format == "PNG" and image.info.get("interlace"):
+        completed_passes = _png_completed_passes(data)
+        if completed_passes == 0:
+            return None
+    elif image.format == "JPEG" and preview_size:
+        image.draft(image.mode, preview_size)
+
+    # ImageFile.load と同じ手順だが、データ末尾で打ち切られても例外にせず途中結果を残す。
+    # LOAD_TRUNCATED_IMAGES はモジュール全体の設定なので、ここでは変更しない。
+    image.load_prepare()
+    decoder_name, extents, offset, args = image.tile[0]
+    read = getattr(image, "load_read", image.fp.read)
+    image.fp.seek(offset)
+    decoder = Image._getdecoder(image.mode, decoder_name, args, image.decoderconfig)
+    ended = False
+    try:
+        decoder.setimage(image.im, extents)
+        buffer = b""
+        while True:
+            try:
+                chunk = read(image.decodermaxblock)
+            except _TRUNCATION_ERRORS:
+                break
+            if not chunk:
+                if image.format != "JPEG" or ended:
+                    break
+                # libjpeg に EOI を渡すと、届いていないスキャンを埋めて最後まで出力する。
+                chunk = b"\xff\xd9"
+                ended = True
+            buffer += chunk
+            consumed, _ = decoder.decode(buffer)
+            if consumed < 0:
+                break
+            buffer = buffer[consumed:]
+    finally:
+        decoder.cleanup()
+    image.tile = []
+
+    if completed_passes:
+        return _sample_grid(image, ADAM7_GRID_STEPS[completed_passes - 1])
+    return image.copy()
+
+
+class StreamingImageLoader:
+    """バックグラウンドで画像を分割読み込みし、途中画像と完成画像を通知するローダー。
+
+    通知はスレッドセーフなキューに溜められ、Tk 側は ``poll`` で取り出す。
+    ``cancel`` を呼ぶと次のチャンクを読む前に読み込みを打ち切る。
+    """
+
+    def __init__(
+        self,
+        image_path: str | Path,
+        preview_size: tuple[int, int] | None = None,
+        chunk_size: int = CHUNK_SIZE,
+        preview_interval: float = PREVIEW_INTERVAL,
+    ) -> None:
+        self.image_path = Path(image_path)
+        self.preview_size = preview_size
+        self.chunk_size = chunk_size
+        self.preview_interval = preview_interval
+
+        self._cancelled = threading.Event()
+        self._updates: queue.SimpleQueue[LoadUpdate] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def start(self) -> None:
+        """読み込みスレッドを開始する。"""
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """読み込みを中断する。既に届いた通知は破棄される。"""
+        self._cancelled.set()
+
+    def poll(self) -> list[LoadUpdate]:
+        """溜まっている通知をすべて取り出す。中断後は何も返さない。"""
+        if self.cancelled:
+            return []
+        updates: list[LoadUpdate] = []
+        while True:
+            try:
+                updates.append(self._updates.get_nowait())
+            except queue.Empty:
+                return updates
+
+    def _run(self) -> None:
+        try:
+            self._read()
+        except Exception as error:  # 例外は Tk 側へ通知して表示させる
+            if not self.cancelled:
+                self._updates.put(LoadUpdate("error", None, 0, 0, error))
+
+    def _read(self) -> None:
+        """チャンク単位で読み込み、一定間隔で途中画像を、最後に完成画像を通知する。"""
+        total_bytes = self.image_path.stat().st_size
+        data = bytearray()
+        next_preview = time.monotonic() + self.preview_interval
+
+        with self.image_path.open("rb") as file:
+            while chunk := file.read(self.chunk_size):
+                if self.cancelled:
+                    return
+                data += chunk
+
+                now = time.monotonic()
+                if now < next_preview or len(data) >= total_bytes:
+                    continue
+
+                preview = decode_partial(bytes(data), self.preview_size)
+                decode_seconds = time.monotonic() - now
+                # 途中デコードの負荷が読み込みを圧迫しないよう、デコード時間に応じて間隔を広げる。
+                next_preview = time.monotonic() + max(self.preview_interval, decode_seconds * 2)
+                if preview is not None and not self.cancelled:
+                    self._updates.put(LoadUpdate("partial", preview, len(data), total_bytes))
+
+        if self.cancelled:
+            return
+        with Image.open(io.BytesIO(data)) as source_image:
+            image = source_image.copy()
+        if not self.cancelled:
+            self._updates.put(LoadUpdate("done", image, len(data), total_bytes))
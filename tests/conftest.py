@@ -0,0 +1,26 @@
+"""テスト共通の設定。src レイアウトのパッケージを読み込めるようにする。"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from image_viewer import configuration  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_config(tmp_path, monkeypatch):
+    """リポジトリの config.toml を書き換えないよう、一時フォルダの設定を使わせる。"""
+    manager = configuration.ConfigManager(
+        config_path=tmp_path / "config.toml",
+        legacy_config_path=tmp_path / "config.ini",
+    )
+    monkeypatch.setattr(configuration, "_manager", manager)
+    return manager
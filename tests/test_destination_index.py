@@ -0,0 +1,170 @@
+"""分類先への 1 件ずつの移動 (衝突ポリシー・大文字小文字・重複検出・上書き防止) のテスト。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from image_viewer import bulk_move, image_catalog
+from image_viewer.destination_index import DestinationIndex
+from image_viewer.image_catalog import ImageCatalog
+
+
+def _save_image(path: Path, width: int, color=(0, 0, 0)) -> Path:
+    """幅と色で内容を変えた小さな PNG を作る。"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", (width, 10), color).save(path)
+    return path
+
+
+@pytest.fixture
+def source_folder(tmp_path):
+    return tmp_path / "source"
+
+
+@pytest.fixture
+def destination_folder(tmp_path):
+    folder = tmp_path / "destination"
+    folder.mkdir()
+    return folder
+
+
+def _scan(folder: Path) -> ImageCatalog:
+    catalog = ImageCatalog()
+    catalog.scan(folder)
+    return catalog
+
+
+@pytest.mark.parametrize(
+    ("policy", "status", "expected_names"),
+    [
+        ("skip", "skipped", ["x.png"]),
+        ("rename", "renamed", ["x (1).png", "x.png"]),
+        ("replace", "replaced", ["x.png"]),
+    ],
+)
+def test_move_applies_collision_policy(source_folder, destination_folder, policy, status, expected_names):
+    source = _save_image(source_folder / "x.png", 20)
+    _save_image(destination_folder / "x.png", 30)
+    catalog = _scan(source_folder)
+
+    plan = catalog.move(source, destination_folder, policy=policy, skip_duplicates=True)
+
+    assert plan.status == status
+    assert sorted(path.name for path in destination_folder.iterdir()) == expected_names
+    assert (str(source) in catalog) is (policy == "skip")
+    assert source.exists() is (policy == "skip")
+    if policy == "replace":
+        with Image.open(destination_folder / "x.png") as replaced:
+            assert replaced.size == (20, 10)
+
+
+def test_move_detects_collision_regardless_of_case(source_folder, destination_folder):
+    source = _save_image(source_folder / "IMG_1.PNG", 20)
+    _save_image(destination_folder / "img_1.png", 30)
+    catalog = _scan(source_folder)
+
+    plan = catalog.move(source, destination_folder, policy="skip", skip_duplicates=True)
+
+    assert plan.status == "skipped"
+    assert source.exists()
+
+
+def test_move_skips_exact_duplicate_under_another_name(source_folder, destination_folder):
+    source = _save_image(source_folder / "a.png", 20, (1, 2, 3))
+    existing = _save_image(destination_folder / "b.png", 20, (1, 2, 3))
+    catalog = _scan(source_folder)
+
+    plan = catalog.move(source, destination_folder, policy="rename", skip_duplicates=True)
+
+    assert plan.status == "duplicate"
+    assert plan.duplicate_of == existing
+    assert source.exists()
+    assert str(source) in catalog
+
+
+def test_move_keeps_duplicate_when_not_skipping(source_folder, destination_folder):
+    source = _save_image(source_folder / "a.png", 20, (1, 2, 3))
+    existing = _save_image(destination_folder / "b.png", 20, (1, 2, 3))
+    catalog = _scan(source_folder)
+
+    plan = catalog.move(source, destination_folder, policy="rename", skip_duplicates=False)
+
+    assert plan.status == "moved"
+    assert plan.duplicate_of == existing
+    assert (destination_folder / "a.png").exists()
+
+
+def test_index_tracks_moves_incrementally(source_folder, destination_folder):
+    first = _save_image(source_folder / "x.png", 20)
+    second = _save_image(source_folder / "sub" / "x.png", 20)
+    catalog = _scan(source_folder)
+
+    catalog.move(first, destination_folder, policy="rename", skip_duplicates=True)
+    plan = catalog.move(second, destination_folder, policy="rename", skip_duplicates=True)
+
+    # 2 件目は 1 件目と同一内容なので、索引に追加済みの 1 件目が重複として見つかる。
+    assert plan.status == "duplicate"
+    assert plan.duplicate_of == destination_folder / "x.png"
+
+
+@pytest.mark.parametrize("same_filesystem", [True, False])
+def test_move_never_overwrites_file_created_by_another_program(
+    source_folder, destination_folder, monkeypatch, same_filesystem
+):
+    monkeypatch.setattr(bulk_move, "_same_filesystem", lambda source, folder: same_filesystem)
+    first = _save_image(source_folder / "a.png", 10)
+    second = _save_image(source_folder / "x.png", 20)
+    catalog = _scan(source_folder)
+
+    real_move_file = image_catalog.move_file
+
+    def move_while_another_program_writes(source, destination, overwrite=False):
+        real_move_file(source, destination, overwrite)
+        if Path(destination).name == "a.png":
+            _save_image(destination_folder / "x.png", 30)
+
+    monkeypatch.setattr(image_catalog, "move_file", move_while_another_program_writes)
+    catalog.move(first, destination_folder, policy="skip", skip_duplicates=True)
+    plan = catalog.move(second, destination_folder, policy="skip", skip_duplicates=True)
+
+    assert plan.status == "skipped"
+    assert second.exists()
+    with Image.open(destination_folder / "x.png") as kept:
+        assert kept.size == (30, 10)
+
+
+def test_record_added_rebuilds_when_folder_changed_before_the_move(destination_folder):
+    index = DestinationIndex(destination_folder)
+    assert not index.contains_name("a.png")
+    _save_image(destination_folder / "external.png", 30)
+
+    mtime_before = index.folder_mtime()
+    added = _save_image(destination_folder / "a.png", 20)
+    index.record_added(added, mtime_before)
+
+    assert index.contains_name("external.png")
+    assert index.contains_name("a.png")
+
+
+@pytest.mark.parametrize("hard_links", [True, False])
+def test_move_file_refuses_to_overwrite_unless_replacing(tmp_path, monkeypatch, hard_links):
+    if not hard_links:
+        monkeypatch.setattr(bulk_move.os, "link", _raise_permission_error)
+    source = _save_image(tmp_path / "source.png", 20)
+    destination = _save_image(tmp_path / "destination.png", 30)
+
+    with pytest.raises(FileExistsError):
+        bulk_move.move_file(source, destination)
+    assert source.exists()
+
+    bulk_move.move_file(source, destination, overwrite=True)
+    assert not source.exists()
+    with Image.open(destination) as replaced:
+        assert replaced.size == (20, 10)
+
+
+def _raise_permission_error(*args, **kwargs):
+    raise PermissionError("hard links are not supported")
@@ -0,0 +1,131 @@
+"""ImageCatalog の走査・変更通知・並び替えと、走査結果 (EXIF・日時) のテスト。"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from image_viewer import image_catalog
+from image_viewer.image_catalog import ImageCatalog
+
+
+def _save_image(path, size):
+    Image.new("RGB", size).save(path)
+    return path
+
+
+@pytest.fixture
+def catalog_with_events(tmp_path):
+    """3 枚の画像を走査したカタログと、受け取った通知のリスト。"""
+    _save_image(tmp_path / "a.png", (100, 10))
+    _save_image(tmp_path / "b.png", (20, 10))
+    _save_image(tmp_path / "c.jpg", (30, 40))
+    catalog = ImageCatalog()
+    events = []
+    catalog.subscribe(events.append)
+    catalog.scan(tmp_path)
+    return catalog, events
+
+
+def test_scan_notifies_reset_once_with_all_records(tmp_path, catalog_with_events):
+    catalog, events = catalog_with_events
+
+    (event,) = events
+    assert event.kind == "reset"
+    assert [record.name for record in event.records] == ["a.png", "b.png", "c.jpg"]
+    assert list(event.records) == list(catalog)
+    assert str(tmp_path / "b.png") in catalog
+    assert catalog.get(tmp_path / "b.png").size_text == "20 x 10"
+
+
+def test_scan_of_missing_folder_keeps_records_and_does_not_notify(tmp_path, catalog_with_events):
+    catalog, events = catalog_with_events
+
+    assert not catalog.scan(tmp_path / "missing")
+    assert len(catalog) == 3
+    assert len(events) == 1
+
+
+def test_sort_by_size_is_numeric(catalog_with_events):
+    catalog, events = catalog_with_events
+    events.clear()
+
+    catalog.sort_by("size")
+
+    # 表示文字列で比べると "100 x 10" が "20 x 10" より前に来てしまう。
+    assert sorted(record.size_text for record in catalog) == ["100 x 10", "20 x 10", "30 x 40"]
+    assert [record.size_text for record in catalog] == ["20 x 10", "30 x 40", "100 x 10"]
+    (event,) = events
+    assert event.kind == "sorted"
+    assert list(event.records) == list(catalog)
+
+
+def test_sort_by_ratio_and_reverse(catalog_with_events):
+    catalog, _ = catalog_with_events
+
+    catalog.sort_by("ratio", reverse=True)
+
+    assert [record.ratio_text for record in catalog] == ["10:1", "2:1", "3:4"]
+
+
+def test_sort_by_unknown_column_raises(catalog_with_events):
+    catalog, events = catalog_with_events
+
+    with pytest.raises(KeyError):
+        catalog.sort_by("missing")
+    assert len(events) == 1
+
+
+def test_remove_many_notifies_once(tmp_path, catalog_with_events):
+    catalog, events = catalog_with_events
+    events.clear()
+
+    removed = catalog.remove_many([tmp_path / "a.png", tmp_path / "missing.png", tmp_path / "c.jpg"])
+
+    assert [record.name for record in removed] == ["a.png", "c.jpg"]
+    assert [record.name for record in catalog] == ["b.png"]
+    (event,) = events
+    assert event.kind == "removed"
+    assert event.records == tuple(removed)
+
+    assert catalog.remove_many([tmp_path / "a.png"]) == []
+    assert len(events) == 1
+
+
+def test_unsubscribe_stops_notifications(tmp_path, catalog_with_events):
+    catalog, events = catalog_with_events
+    catalog.unsubscribe(events.append)
+
+    catalog.remove(tmp_path / "a.png")
+
+    assert len(events) == 1
+
+
+def test_scan_reads_exif_capture_date_and_orientation(tmp_path):
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x8769] = {0x9003: "2020:05:06 07:08:09"}
+    Image.new("RGB", (40, 20)).save(tmp_path / "rotated.jpg", exif=exif.tobytes())
+
+    catalog = ImageCatalog()
+    catalog.scan(tmp_path)
+    (record,) = list(catalog)
+
+    assert record.orientation == 6
+    assert (record.width, record.height) == (20, 40)
+    assert record.created_text == "2020/05/06 07:08"
+
+
+@pytest.mark.parametrize(
+    ("is_windows", "stat", "expected"),
+    [
+        (False, SimpleNamespace(st_birthtime=1.0, st_ctime=2.0, st_mtime=3.0), 1.0),
+        (True, SimpleNamespace(st_ctime=2.0, st_mtime=3.0), 2.0),
+        (False, SimpleNamespace(st_ctime=2.0, st_mtime=3.0), 3.0),
+    ],
+)
+def test_file_created_time_fallback(monkeypatch, is_windows, stat, expected):
+    monkeypatch.setattr(image_catalog, "_IS_WINDOWS", is_windows)
+    assert image_catalog._file_created_time(stat) == expected
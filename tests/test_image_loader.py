@@ -0,0 +1,227 @@
+"""途中までのデータのデコード (JPEG・PNG・Adam7) とバックグラウンドローダーのテスト。"""
+
+from __future__ import annotations
+
+import io
+import struct
+import zlib
+
+import pytest
+from PIL import Image
+
+from image_viewer.image_loader import (
+    ADAM7_PASSES,
+    StreamingImageLoader,
+    _png_completed_passes,
+    _sample_grid,
+    decode_partial,
+)
+
+RED = (200, 40, 40)
+BLUE = (40, 40, 200)
+GRAY = (10, 20, 30)
+
+# zlib の無圧縮ブロックで IDAT を作ったときの、画素データより前にあるバイト数
+# (シグネチャ 8 + IHDR 25 + IDAT の長さと種別 8 + zlib ヘッダー 2 + ブロックヘッダー 5)
+STORED_IDAT_HEADER = 8 + 25 + 8 + 2 + 5
+
+
+def _two_tone_image(size=(256, 256)) -> Image.Image:
+    """上半分が赤、下半分が青の画像。"""
+    image = Image.new("RGB", size, RED)
+    image.paste(BLUE, (0, size[1] // 2, size[0], size[1]))
+    return image
+
+
+def _encode(image: Image.Image, format: str, **params) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format, **params)
+    return buffer.getvalue()
+
+
+def _png_chunk(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+
+
+def _adam7_png(image: Image.Image) -> tuple[bytes, list[int]]:
+    """Pillow は Adam7 で保存できないため、RGB 画像を無圧縮の Adam7 PNG に手で符号化する。
+
+    各パスが終わる位置 (展開後のバイト数) も返す。
+    """
+    width, height = image.size
+    pixels = image.load()
+    raw = bytearray()
+    pass_ends = []
+    for x0, y0, x_step, y_step in ADAM7_PASSES:
+        columns = range(x0, width, x_step)
+        if columns:
+            for y in range(y0, height, y_step):
+                raw.append(0)
+                for x in columns:
+                    raw.extend(pixels[x, y])
+        pass_ends.append(len(raw))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 1)
+    data = (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", header)
+        + _png_chunk(b"IDAT", zlib.compress(bytes(raw), 0))
+        + _png_chunk(b"IEND", b"")
+    )
+    return data, pass_ends
+
+
+@pytest.fixture
+def adam7_image() -> Image.Image:
+    """8 画素間隔の格子点だけが目立つ色の画像。"""
+    image = Image.new("RGB", (32, 32), GRAY)
+    image.putpixel((0, 0), RED)
+    image.putpixel((8, 0), BLUE)
+    return image
+
+
+def test_decode_partial_baseline_jpeg_shows_rows_received_so_far():
+    data = _encode(_two_tone_image(), "JPEG", quality=90)
+
+    preview = decode_partial(data[: len(data) // 2])
+
+    assert preview.size == (256, 256)
+    assert preview.getpixel((10, 10)) == pytest.approx(RED, abs=8)
+    assert preview.getpixel((10, 240)) != pytest.approx(BLUE, abs=8)
+
+
+def test_decode_partial_progressive_jpeg_shows_whole_image_after_first_scan():
+    data = _encode(_two_tone_image(), "JPEG", quality=90, progressive=True)
+    first_scan = data.index(b"\xff\xda")
+    second_scan = data.index(b"\xff\xda", first_scan + 2)
+
+    preview = decode_partial(data[:second_scan])
+
+    assert preview.size == (256, 256)
+    assert preview.getpixel((10, 10)) == pytest.approx(RED, abs=16)
+    assert preview.getpixel((10, 240)) == pytest.approx(BLUE, abs=16)
+
+
+def test_decode_partial_jpeg_uses_draft_for_preview_size():
+    data = _encode(_two_tone_image((512, 512)), "JPEG")
+
+    preview = decode_partial(data[: len(data) // 2], preview_size=(64, 64))
+
+    assert preview.size == (64, 64)
+
+
+def test_decode_partial_png_shows_rows_received_so_far():
+    data = _encode(_two_tone_image(), "PNG", compress_level=0)
+
+    preview = decode_partial(data[: len(data) // 4])
+
+    assert preview.size == (256, 256)
+    assert preview.getpixel((10, 10)) == RED
+    assert preview.getpixel((10, 240)) != BLUE
+
+
+def test_decode_partial_adam7_png_expands_completed_pass(adam7_image):
+    data, pass_ends = _adam7_png(adam7_image)
+
+    preview = decode_partial(data[: STORED_IDAT_HEADER + pass_ends[0]])
+
+    assert preview.size == (32, 32)
+    # 1 パス目は 8x8 間隔の格子点だけなので、格子点の色がブロック全体に広がる。
+    assert preview.getpixel((0, 0)) == RED
+    assert preview.getpixel((7, 7)) == RED
+    assert preview.getpixel((8, 3)) == BLUE
+    assert preview.getpixel((31, 31)) == GRAY
+
+
+def test_decode_partial_returns_none_until_displayable(adam7_image):
+    data, _ = _adam7_png(adam7_image)
+
+    assert decode_partial(data[:STORED_IDAT_HEADER]) is None
+    assert decode_partial(b"not an image") is None
+    assert decode_partial(_encode(_two_tone_image(), "GIF")) is None
+
+
+def test_png_completed_passes_counts_decompressed_passes(adam7_image):
+    data, pass_ends = _adam7_png(adam7_image)
+
+    assert _png_completed_passes(data[:20]) == 0
+    assert _png_completed_passes(b"GIF89a" + data[6:]) == 0
+    assert _png_completed_passes(data[:STORED_IDAT_HEADER]) == 0
+    for passes, end in enumerate(pass_ends, start=1):
+        assert _png_completed_passes(data[: STORED_IDAT_HEADER + end]) == passes
+        assert _png_completed_passes(data[: STORED_IDAT_HEADER + end - 1]) == passes - 1
+    assert _png_completed_passes(data) == 7
+
+
+def test_sample_grid_spreads_known_pixels(adam7_image):
+    assert _sample_grid(adam7_image, (1, 1)) is adam7_image
+
+    grid = _sample_grid(adam7_image, (8, 8))
+
+    assert grid.size == adam7_image.size
+    assert {grid.getpixel((x, y)) for x in range(8) for y in range(8)} == {RED}
+    assert {grid.getpixel((x, y)) for x in range(8, 16) for y in range(8)} == {BLUE}
+    assert grid.getpixel((16, 0)) == GRAY
+
+
+def _wait_for_final_update(loader: StreamingImageLoader):
+    """ローダーのスレッド終了を待ち、すべての通知を返す。"""
+    loader._thread.join(timeout=10)
+    assert not loader._thread.is_alive()
+    return loader.poll()
+
+
+def test_loader_reports_partial_frames_then_done(tmp_path):
+    path = tmp_path / "image.png"
+    path.write_bytes(_encode(_two_tone_image(), "PNG", compress_level=0))
+    loader = StreamingImageLoader(path, chunk_size=16 * 1024, preview_interval=0)
+
+    loader.start()
+    updates = _wait_for_final_update(loader)
+
+    assert [update.kind for update in updates[:-1]] == ["partial"] * (len(updates) - 1)
+    assert len(updates) > 1
+    done = updates[-1]
+    assert done.kind == "done"
+    assert done.bytes_read == done.total_bytes == path.stat().st_size
+    assert done.image.getpixel((10, 240)) == BLUE
+
+
+def test_loader_reports_error(tmp_path):
+    path = tmp_path / "broken.png"
+    path.write_bytes(b"not an image")
+    loader = StreamingImageLoader(path)
+
+    loader.start()
+    (update,) = _wait_for_final_update(loader)
+
+    assert update.kind == "error"
+    assert update.image is None
+    assert update.error is not None
+
+
+def test_loader_stops_when_cancelled(tmp_path):
+    path = tmp_path / "image.png"
+    path.write_bytes(_encode(_two_tone_image(), "PNG", compress_level=0))
+    loader = StreamingImageLoader(path, chunk_size=1024, preview_interval=0)
+
+    loader.cancel()
+    loader.start()
+    loader._thread.join(timeout=10)
+
+    assert loader.cancelled
+    assert not loader._thread.is_alive()
+    # poll は中断後に何も返さないため、キューに通知が積まれていないことを直接確かめる。
+    assert loader._updates.empty()
+
+
+def test_loader_discards_received_updates_when_cancelled(tmp_path):
+    path = tmp_path / "image.png"
+    path.write_bytes(_encode(_two_tone_image(), "PNG"))
+    loader = StreamingImageLoader(path)
+
+    loader.start()
+    loader._thread.join(timeout=10)
+    loader.cancel()
+
+    assert loader.poll() == []
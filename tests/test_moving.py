@@ -0,0 +1,116 @@
+"""一括移動 (同名ファイル・一括内の重複・失敗時の後始末) のテスト。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from image_viewer import bulk_move
+from image_viewer.bulk_move import BulkMover
+from image_viewer.destination_index import DestinationIndex
+from image_viewer.image_catalog import ImageCatalog
+
+
+def _save_image(path: Path, width: int, color=(0, 0, 0)) -> Path:
+    """幅と色で内容を変えた小さな PNG を作る。"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", (width, 10), color).save(path)
+    return path
+
+
+@pytest.fixture
+def source_folder(tmp_path):
+    return tmp_path / "source"
+
+
+@pytest.fixture
+def destination_folder(tmp_path):
+    folder = tmp_path / "destination"
+    folder.mkdir()
+    return folder
+
+
+def _scan(folder: Path) -> ImageCatalog:
+    catalog = ImageCatalog()
+    catalog.scan(folder)
+    return catalog
+
+
+@pytest.mark.parametrize("policy", ["skip", "rename", "replace"])
+@pytest.mark.parametrize("same_filesystem", [True, False])
+def test_bulk_move_keeps_every_same_named_file(
+    source_folder, destination_folder, monkeypatch, policy, same_filesystem
+):
+    monkeypatch.setattr(bulk_move, "_same_filesystem", lambda source, folder: same_filesystem)
+    for index in range(6):
+        _save_image(source_folder / f"d{index}" / "x.png", 10 + index)
+    catalog = _scan(source_folder)
+
+    result = catalog.move_many(
+        ((record.path, destination_folder) for record in list(catalog)),
+        policy=policy,
+        skip_duplicates=True,
+    )
+
+    assert not result.failed
+    assert len(result.moved) == 6
+    assert len(catalog) == 0
+    widths = set()
+    for path in destination_folder.iterdir():
+        with Image.open(path) as moved:
+            widths.add(moved.width)
+    assert widths == {10, 11, 12, 13, 14, 15}
+    assert not list(destination_folder.glob("*.partial"))
+
+
+def test_bulk_move_skips_duplicates_within_batch(source_folder, destination_folder):
+    _save_image(source_folder / "a.png", 20, (5, 5, 5))
+    _save_image(source_folder / "b.png", 20, (5, 5, 5))
+    catalog = _scan(source_folder)
+
+    result = catalog.move_many(
+        ((record.path, destination_folder) for record in list(catalog)),
+        policy="rename",
+        skip_duplicates=True,
+    )
+
+    assert [plan.status for plan in result.moved] == ["moved"]
+    assert [plan.status for plan in result.skipped] == ["duplicate"]
+    assert len(catalog) == 1
+
+
+def test_bulk_move_failure_leaves_no_partial_and_rebuilds_index(
+    source_folder, destination_folder, monkeypatch
+):
+    monkeypatch.setattr(bulk_move, "_same_filesystem", lambda source, folder: False)
+    good = _save_image(source_folder / "good.png", 20)
+    bad = _save_image(source_folder / "bad.png", 30)
+    catalog = _scan(source_folder)
+    plans = catalog.plan_moves([(good, destination_folder), (bad, destination_folder)], "rename", True)
+    bad.unlink()
+
+    result = BulkMover(plans, max_workers=2).run()
+    catalog.apply_moves(result)
+
+    assert [plan.source for plan in result.moved] == [good]
+    assert [plan.source for plan, _ in result.failed] == [bad]
+    assert sorted(path.name for path in destination_folder.iterdir()) == ["good.png"]
+    # 失敗した予約が残っていなければ、同じ名前は衝突しない。
+    assert not catalog.destination_index(destination_folder).contains_name("bad.png")
+    assert str(good) not in catalog
+    assert str(bad) in catalog
+
+
+def test_bulk_mover_refuses_duplicate_destinations(source_folder, destination_folder):
+    first = _save_image(source_folder / "a" / "x.png", 20)
+    second = _save_image(source_folder / "b" / "x.png", 30)
+    index = DestinationIndex(destination_folder)
+    plans = [index.plan_move(first, "replace"), index.plan_move(second, "replace")]
+
+    result = BulkMover(plans).run()
+
+    assert [plan.source for plan in result.moved] == [first]
+    assert [plan.source for plan, _ in result.failed] == [second]
+    assert second.exists()